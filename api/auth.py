@@ -35,16 +35,45 @@ Notes:
 # Libs / Includes
 
 from functools import wraps
-from flask import request, abort, g, make_response, current_app
+from flask import request, abort, g, make_response
 import secrets
-import os
+import hashlib
+import threading
 
-from config import API_KEY, ADMIN_USER, ADMIN_PASSWORD, REALM_NAME
+from cachetools import TTLCache
+
+from config import (
+    REALM_NAME,
+    API_KEY_BYTES, ADMIN_BASIC_BYTES,
+    HAS_API_KEY, HAS_ADMIN,
+)
 # from itsdangerous import URLSafeSerializer, BadSignature   # (optional)
 #-----------------------------------------------------------------------------#
 
 
 
+#-----------------------------------------------------------------------------#
+# Credential Cache
+
+# Per-process secret used to key the credential hashes, so cache keys
+# cannot be predicted or probed from outside the process
+_PROCESS_SECRET = secrets.token_bytes(32)
+
+# Hashes of recently validated credentials (only successes are stored)
+_auth_cache = TTLCache(maxsize=256, ttl=60)
+_auth_cache_lock = threading.Lock()
+
+# Random stand-ins compared against when credentials are not configured,
+# so an unconfigured server spends the same work as a configured one
+_DUMMY_KEY      = secrets.token_bytes(max(32, len(API_KEY_BYTES)))
+_DUMMY_BASIC    = secrets.token_bytes(max(32, len(ADMIN_BASIC_BYTES)))
+
+# Precomputed challenge header for 401 responses
+_WWW_AUTH = f'Basic realm="{REALM_NAME}"'
+#-----------------------------------------------------------------------------#
+
+
+
 #-----------------------------------------------------------------------------#
 # Setup & Utility Functions
 
@@ -53,10 +82,102 @@ def _unauthorized_response(realm=REALM_NAME):
     Return a proper HTTP 401 Unauthorized response including the
     WWW-Authenticate header required by Basic Authentication clients.
     """
-    resp = make_response("Unauthorized", 401)
-    resp.headers["WWW-Authenticate"] = f'Basic realm="{realm}"'
+    resp = make_response(b"Unauthorized", 401)
+    resp.headers["WWW-Authenticate"] = (
+        _WWW_AUTH if realm == REALM_NAME else f'Basic realm="{realm}"')
     return resp
 
+#-----------------------------------------------------------------------------#
+
+def _get_api_key_header(header_name="X-API-Key"):
+    """
+    Return the API key header of the current request.
+    The default header is looked up once and cached on flask.g, so the
+    global hook and per-route decorators share the same value.
+    """
+    if header_name != "X-API-Key":
+        return request.headers.get(header_name)
+
+    if "x_api_key" not in g:
+        g.x_api_key = request.headers.get(header_name)
+    return g.x_api_key
+
+#-----------------------------------------------------------------------------#
+
+def _credential_digest(*parts: str) -> bytes:
+    """
+    Return a keyed BLAKE2b digest of the given credential parts.
+    Each part is length-prefixed so ("ab", "c") and ("a", "bc") differ.
+    """
+    h = hashlib.blake2b(digest_size=16, key=_PROCESS_SECRET)
+    for part in parts:
+        data = part.encode("utf-8")
+        h.update(len(data).to_bytes(4, "big"))
+        h.update(data)
+    return h.digest()
+
+#-----------------------------------------------------------------------------#
+
+def _cached_check(digest: bytes, check) -> bool:
+    """
+    Return True if the credential digest was validated recently,
+    otherwise run the constant-time check and cache a success.
+    """
+    with _auth_cache_lock:
+        if _auth_cache.get(digest):
+            return True
+
+    if not check():
+        return False
+
+    with _auth_cache_lock:
+        _auth_cache[digest] = True
+    return True
+
+#-----------------------------------------------------------------------------#
+
+def clear_auth_cache():
+    """Drop all cached credential decisions (e.g. after config reload)."""
+    with _auth_cache_lock:
+        _auth_cache.clear()
+
+#-----------------------------------------------------------------------------#
+
+def _api_key_valid(x_api_key: str) -> bool:
+    """
+    Check a presented API key against the configured one.
+    Fails closed: without a configured key the comparison still runs
+    (against a random dummy) and the result is always rejected.
+    """
+    expected = API_KEY_BYTES if HAS_API_KEY else _DUMMY_KEY
+
+    ok = _cached_check(
+        _credential_digest("api", x_api_key),
+        lambda: secrets.compare_digest(x_api_key.encode("utf-8"), expected)
+    )
+    return HAS_API_KEY and ok
+
+#-----------------------------------------------------------------------------#
+
+def _basic_auth_valid(auth) -> bool:
+    """
+    Check presented Basic Auth credentials against the admin account.
+    Username and password are joined as "user\0password" and checked with
+    a single constant-time comparison, so timing does not reveal which
+    of the two was wrong. Fails closed like _api_key_valid().
+    """
+    expected = ADMIN_BASIC_BYTES if HAS_ADMIN else _DUMMY_BASIC
+
+    username = auth.username or ""
+    password = auth.password or ""
+
+    def check():
+        presented = (username + "\x00" + password).encode("utf-8")
+        return secrets.compare_digest(presented, expected)
+
+    ok = _cached_check(_credential_digest("basic", username, password), check)
+    return HAS_ADMIN and ok
+
 #-----------------------------------------------------------------------------#
 # Basic Authentication (Admin Access)
 def require_basic_auth(func):
@@ -66,18 +187,20 @@ def require_basic_auth(func):
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
+        # Already validated by the global hook during this request
+        if g.get("basic_ok", False):
+            return func(*args, **kwargs)
+
         auth = request.authorization
         if not auth:
             return _unauthorized_response()
 
-        
-        username_ok = secrets.compare_digest(auth.username or "", ADMIN_USER or "")
-        password_ok = secrets.compare_digest(auth.password or "", ADMIN_PASSWORD or "")
-        if not (username_ok and password_ok):
+        if not _basic_auth_valid(auth):
             return _unauthorized_response()
 
          # Optionally expose authenticated user to the application context
         g.user = auth.username
+        g.basic_ok = True
         return func(*args, **kwargs)
 
     return wrapper
@@ -89,12 +212,18 @@ def check_api_key_value(x_api_key: str | None):
     Validate that an API key is provided and matches the expected value.
     On failure, abort with appropriate HTTP status code.
     """
+    # Already validated by the global hook during this request
+    if g.get("api_key_ok", False):
+        return
+
     if not x_api_key:
         abort(401, description="Missing API key")
 
-    if not (API_KEY and secrets.compare_digest(x_api_key, API_KEY)):
+    if not _api_key_valid(x_api_key):
         abort(403, description="Invalid API key")
 
+    g.api_key_ok = True
+
 #-----------------------------------------------------------------------------#
 
 def require_api_key(header_name="X-API-Key"):
@@ -106,7 +235,7 @@ def require_api_key(header_name="X-API-Key"):
         @wraps(func)
         def wrapper(*args, **kwargs):
             # header names are case-insensitive in Flask
-            x_api_key = request.headers.get(header_name)
+            x_api_key = _get_api_key_header(header_name)
             check_api_key_value(x_api_key)
             return func(*args, **kwargs)
         return wrapper
@@ -135,7 +264,7 @@ def verify_session_cookie(token: str):
 
 #-----------------------------------------------------------------------------#
 # Global Authentication Wrapper
-def require_auth_everywhere(app, exempt_paths=None):
+def require_auth_everywhere(app, exempt_paths=None, exempt_prefixes=()):
     """
     Attach a before_request hook that protects the entire Flask application.
     A request is accepted if it contains either:
@@ -145,25 +274,38 @@ def require_auth_everywhere(app, exempt_paths=None):
     exempt_paths : list[str]
         A list of URL paths that do NOT require authentication.
         Example: ['/', '/health']
+
+    exempt_prefixes : tuple[str]
+        URL path prefixes that do NOT require authentication.
+        Example: ('/static/',)
     """
-    exempt_paths = exempt_paths or ["/", "/health"]
+    # Converted once, so the per-request check is a single hash lookup
+    exempt_paths = frozenset(exempt_paths or ("/", "/health"))
+    exempt_prefixes = tuple(exempt_prefixes)
 
     @app.before_request
     def _global_auth():
         # Skip authentication for exempted endpoints
-        if request.path in exempt_paths:
+        path = request.path
+        if path in exempt_paths:
+            return None
+
+        if exempt_prefixes and path.startswith(exempt_prefixes):
             return None
 
         # 1) Accept valid API-Key
-        x_api = request.headers.get("X-API-Key")
-        if x_api and API_KEY and secrets.compare_digest(x_api, API_KEY):
+        x_api = _get_api_key_header()
+        if x_api and _api_key_valid(x_api):
+            g.api_key_ok = True
             return None
 
         # 2) Accept valid Basic Auth
+        # (request.authorization is a Werkzeug cached_property — the header
+        #  is parsed once per request and shared with require_basic_auth)
         auth = request.authorization
-        if auth and secrets.compare_digest(auth.username or "", ADMIN_USER or "") and \
-                secrets.compare_digest(auth.password or "", ADMIN_PASSWORD or ""):
+        if auth and _basic_auth_valid(auth):
             g.user = auth.username
+            g.basic_ok = True
             return None
 
         # Otherwise reject request
@@ -20,9 +20,12 @@ License:
     See: https://creativecommons.org/licenses/by-nc-sa/4.0/deed.en
 
 Notes:
-    • The .env file must exist in the project root.
+    • The .env file must exist next to this file (api/.env).
+    • Variables already set in the process environment (e.g. by systemd
+      or a parent process) take precedence over the .env file.
     • Environment variables include API key, admin credentials, 
-      and the HTTP authentication realm name.
+      the HTTP authentication realm name and the database paths (DB_FILE,
+      BUFFER_FILE).
     • Values are imported by auth.py and other modules at runtime.
 """
 #-----------------------------------------------------------------------------#
@@ -33,6 +36,7 @@ Notes:
 # Libs / Includes
 
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 #-----------------------------------------------------------------------------#
 
@@ -42,11 +46,52 @@ from dotenv import load_dotenv
 # Load Environment Variables
 
 # Load key-value pairs from .env file into process environment
-load_dotenv()
+# (explicit path avoids find_dotenv() walking up the directory tree;
+# override=False: variables already set in the environment win)
+_ENV_PATH = Path(__file__).with_name(".env")
+if _ENV_PATH.exists():
+    load_dotenv(_ENV_PATH, override=False)
 
 # Retrieve environment variables used by the backend
 API_KEY        = os.getenv("API_KEY")
 ADMIN_USER     = os.getenv("ADMIN_USER")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 REALM_NAME     = os.getenv("REALM_NAME", "My-RPi-Server")
+
+# Data source of the IoT informer: "db" (read server.db directly, 
+# read-only) or "http" (query the REST API)
+INFORMER_SOURCE = os.getenv("INFORMER_SOURCE", "db")
+
+# Base URL of the REST API used by the Pi-side scripts (src/). An IP literal
+# skips the resolver lookup of "localhost" on every new connection.
+SERVER_URL = os.getenv("SERVER_URL", "http://127.0.0.1:5000").rstrip("/")
+
+# Absolute path of the SQLite database (default: api/server.db), shared by
+# the backend and the IoT informer independent of their working directory
+DB_FILE = str(Path(os.getenv("DB_FILE") or Path(__file__).with_name("server.db"))
+              .resolve())
+
+# Local SQLite buffer of readings read_i2c.py could not deliver yet
+# (default: src/py/unsent_readings.db, git-ignored)
+BUFFER_FILE = str(Path(os.getenv("BUFFER_FILE") or Path(__file__).parent.parent
+                       / "src" / "py" / "unsent_readings.db").resolve())
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Precomputed Credentials
+
+# Byte-encoded credentials, computed once so the auth hot path does not
+# re-evaluate fallbacks or re-encode strings on every request
+API_KEY_BYTES        = (API_KEY or "").encode("utf-8")
+ADMIN_USER_BYTES     = (ADMIN_USER or "").encode("utf-8")
+ADMIN_PASSWORD_BYTES = (ADMIN_PASSWORD or "").encode("utf-8")
+
+# "user\0password" — lets Basic Auth check both fields in one comparison
+ADMIN_BASIC_BYTES    = ADMIN_USER_BYTES + b"\x00" + ADMIN_PASSWORD_BYTES
+
+# Flags telling whether the credentials are actually configured
+HAS_API_KEY = bool(API_KEY_BYTES)
+HAS_ADMIN   = bool(ADMIN_USER_BYTES and ADMIN_PASSWORD_BYTES)
 #-----------------------------------------------------------------------------#
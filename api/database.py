@@ -19,9 +19,13 @@ License:
     See: https://creativecommons.org/licenses/by-nc-sa/4.0/deed.en
 
 Notes:
-    • The database file is stored locally as server.db.
+    • The database file is stored as api/server.db (override: DB_FILE).
     • All table creation logic is delegated to db_models.py.
     • Used by server.py during the startup process.
+    • Connections are reused from a small pool. Always borrow them with
+          with get_connection() as conn:
+              ...
+      and never close them yourself.
 """
 #-----------------------------------------------------------------------------#
 
@@ -31,7 +35,12 @@ Notes:
 # Libs / Includes
 
 import sqlite3
-import os
+import queue
+import atexit
+from contextlib import contextmanager
+
+import config
+from db_models import create_tables
 #-----------------------------------------------------------------------------#
 
 
@@ -39,8 +48,87 @@ import os
 #-----------------------------------------------------------------------------#
 # Setup
 
-# Absolute path to the SQLite database file (located in project root)
-DB_FILE = "server.db"
+# Absolute path to the SQLite database file (api/server.db, see config.py)
+DB_FILE = config.DB_FILE
+
+# Max. number of idle connections kept open by the pool
+POOL_SIZE = 4
+
+# PRAGMAs applied once to every new connection (they are per-connection
+# settings; journal_mode=WAL is persistent and set once in init_db())
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",    # fsync on checkpoint, not every commit
+    "PRAGMA cache_size=-20000",     # ~20 MB page cache
+    "PRAGMA mmap_size=134217728",   # 128 MB memory-mapped reads
+    "PRAGMA temp_store=MEMORY",
+)
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Connection Pool
+
+class SQLitePool:
+    """
+    Small pool of long-lived SQLite3 connections.
+
+    Borrowed connections are returned to the pool instead of being closed,
+    so SQLite's page and statement caches stay warm between requests.
+    If all pooled connections are busy, a new one is opened; on release
+    it is closed again if the pool is already full.
+    """
+
+    def __init__(self, db_file, size=POOL_SIZE):
+        self.db_file = db_file
+        self._idle = queue.Queue(maxsize=size)
+
+    def _open(self):
+        """
+        Open a new SQLite3 connection and apply the connection PRAGMAs.
+
+        check_same_thread=False:
+            Allows database access from different threads. 
+            Required because Flask routes may run in separate threads.
+        """
+        conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _release(self, conn):
+        """Return a connection to the pool (or close it if the pool is full)."""
+        if conn.in_transaction:
+            conn.rollback()     # never hand out a half-finished transaction
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection for the duration of a with-block."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+pool = SQLitePool(DB_FILE)
+atexit.register(pool.close)
 #-----------------------------------------------------------------------------#
 
 
@@ -50,14 +138,13 @@ DB_FILE = "server.db"
 
 def get_connection():
     """
-    Return a thread-safe SQLite3 connection.
+    Borrow a pooled SQLite3 connection.
 
-    check_same_thread=False:
-        Allows database access from different threads. 
-        Required because Flask routes may run in separate threads.
+    Usage:
+        with get_connection() as conn:
+            conn.execute(...)
     """
-    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
-    return conn
+    return pool.acquire()
 
 #-----------------------------------------------------------------------------#
 
@@ -65,8 +152,14 @@ def init_db():
     """
     Initialize the database and create all required tables.
     The actual table definitions live in db_models.py.
+
+    Also switches the database file to WAL journal mode. The mode is
+    stored in the file, so it applies to every later connection and
+    lets readers run concurrently with the writer.
     """
-    from db_models import create_tables
+    with get_connection() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+
     create_tables()
 
 #-----------------------------------------------------------------------------#
\ No newline at end of file
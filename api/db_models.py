@@ -28,9 +28,10 @@ Notes:
 
 
 #-----------------------------------------------------------------------------#
-# Libs / Includes
+# Setup
 
-from database import get_connection
+# Set after the first successful create_tables() call in this process
+_INITIALIZED = False
 #-----------------------------------------------------------------------------#
 
 
@@ -38,24 +39,80 @@ from database import get_connection
 #-----------------------------------------------------------------------------#
 # Function Defs
 
-def create_tables():
+def _migrate_value_to_real(cursor):
     """
-    Create all required database tables if they do not exist.
-    Currently includes:
-        • sensor_data — stores sensor values, types, and timestamp.
+    Rebuild sensor_data with value REAL if it still has the old TEXT column.
+    Values are copied as-is: REAL affinity converts numeric text, anything
+    else is kept unchanged (not coerced to 0.0); ids are kept.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    columns = {row[1]: row[2] for row in
+               cursor.execute('PRAGMA table_info(sensor_data)')}
+    if columns.get('value', '').upper() != 'TEXT':
+        return
+
+    # One transaction, so a failed migration leaves the old table untouched
+    if not cursor.connection.in_transaction:
+        cursor.execute('BEGIN')
 
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sensor_data (
+        CREATE TABLE sensor_data_new (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             sensor_type TEXT,
-            value TEXT,
+            value REAL,
             timestamp DATETIME DEFAULT (datetime('now','localtime'))
         )
     ''')
+    cursor.execute('''
+        INSERT INTO sensor_data_new (id, sensor_type, value, timestamp)
+        SELECT id, sensor_type, value, timestamp FROM sensor_data
+    ''')
+    cursor.execute('DROP TABLE sensor_data')
+    cursor.execute('ALTER TABLE sensor_data_new RENAME TO sensor_data')
+    print("[DB] Migrated sensor_data.value from TEXT to REAL")
+
+#-----------------------------------------------------------------------------#
+
+def create_tables():
+    """
+    Create all required database tables if they do not exist.
+    Currently includes:
+        • sensor_data — stores sensor values (REAL), types, and timestamp.
+        • idx_sensor_type_id — index for "latest N of one sensor" queries.
+
+    Runs only once per process; subsequent calls return immediately.
+    """
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+
+    # Imported here: database.py imports this module at its top
+    from database import get_connection
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        # Note: id is the rowid, so "ORDER BY id DESC LIMIT n" walks the table
+        # btree backwards and reads only n rows — no extra index is needed.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sensor_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sensor_type TEXT,
+                value REAL,
+                timestamp DATETIME DEFAULT (datetime('now','localtime'))
+            )
+        ''')
+
+        # Databases created before values were stored as REAL
+        _migrate_value_to_real(cursor)
+
+        # Serves "WHERE sensor_type = ? ORDER BY id DESC LIMIT n" (/sensors/get)
+        # as an index range scan instead of a full scan + sort
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_sensor_type_id
+            ON sensor_data(sensor_type, id DESC)
+        ''')
+
+        conn.commit()
 
-    conn.commit()
-    conn.close()
+    _INITIALIZED = True
 #-----------------------------------------------------------------------------#
@@ -33,6 +33,6 @@ Notes:
 # Schema describing expected fields for sensor entries
 sensor_schema = {
     "sensor_type": str,   # Type/category of the sensor (e.g., "temperature")
-    "value": str          # Raw sensor value stored as string
+    "value": float        # Numeric sensor value (stored as REAL)
 }
 #-----------------------------------------------------------------------------#
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+#-----------------------------------------------------------------------------#
+"""
+File:           db_writer.py
+Author(s):      Mika Paul Salewski
+Created:        2026-10-15
+Last Updated:   2026-10-15
+Version:        2026.10.15
+
+Title:
+    Write-behind queue for sensor readings of the Raspberry Pi REST API backend.
+
+Short Description:
+    Collects incoming sensor readings in an in-process queue and stores them
+    from a single background writer thread. Rows are inserted in batches
+    with executemany() inside one transaction, so many readings share one
+    commit instead of paying one each.
+
+License:
+    CC BY-NC-SA 4.0
+    See: https://creativecommons.org/licenses/by-nc-sa/4.0/deed.en
+
+Notes:
+    • start_writer() is called once by server.py after database.init_db().
+    • Durability window: a reading is written at most FLUSH_INTERVAL seconds
+      after it was accepted. Readings still queued when the process is
+      killed hard (e.g. power loss) are lost; on a normal exit the queue
+      is flushed.
+    • Only one writer thread exists per process. Under gunicorn each worker
+      has its own writer, so "database is locked" is retried with backoff;
+      a row that cannot be stored is skipped without dropping its batch.
+    • Callbacks registered with add_flush_listener() run after each
+      committed batch (e.g. to invalidate response caches).
+"""
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Libs / Includes
+
+import queue
+import sqlite3
+import threading
+import time
+import atexit
+
+from database import get_connection
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Setup
+
+FLUSH_INTERVAL = 0.05      # Max. seconds a reading waits in the queue
+BATCH_SIZE     = 100       # Max. rows written per transaction
+QUEUE_MAXSIZE  = 10000     # Pending readings before enqueue() fails
+WRITE_RETRIES  = 8         # Attempts per batch on transient errors (locked/busy)
+RETRY_BACKOFF  = 0.05      # First retry delay in seconds, doubled per attempt
+RETRY_MAX_WAIT = 1.0       # Upper bound for a single retry delay
+
+# Errors caused by the data of a single row (not by the database state)
+_ROW_ERRORS = (sqlite3.InterfaceError, sqlite3.ProgrammingError,
+               sqlite3.IntegrityError, sqlite3.DataError)
+
+# Shared with /sensors/add_bulk; constant text keeps SQLite's statement cache hot
+INSERT_SQL = 'INSERT INTO sensor_data (sensor_type, value) VALUES (?, ?)'
+
+_queue = queue.Queue(maxsize=QUEUE_MAXSIZE)
+_stop = threading.Event()
+_thread = None
+_flush_listeners = []
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Function Defs
+
+def enqueue(sensor_type, value):
+    """
+    Queue one sensor reading for the writer thread.
+    Raises queue.Full if the writer cannot keep up.
+    """
+    _queue.put_nowait((sensor_type, value))
+
+#-----------------------------------------------------------------------------#
+
+def add_flush_listener(callback):
+    """Register a callback invoked (without args) after each committed batch."""
+    _flush_listeners.append(callback)
+
+#-----------------------------------------------------------------------------#
+
+def _drain(timeout):
+    """
+    Wait up to timeout seconds for a first reading, then collect
+    everything else already queued (up to BATCH_SIZE rows).
+    """
+    try:
+        batch = [_queue.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+
+    while len(batch) < BATCH_SIZE:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+
+    return batch
+
+#-----------------------------------------------------------------------------#
+
+def _insert(conn, batch):
+    """
+    Insert batch in one transaction and return the number of rows written.
+    If a row cannot be bound/stored, the batch is re-inserted row by row
+    and only the offending rows are skipped.
+    """
+    try:
+        with conn:
+            conn.executemany(INSERT_SQL, batch)
+        return len(batch)
+    except _ROW_ERRORS as e:
+        print(f"[DB] Batch rejected ({e}), inserting row by row")
+
+    written = 0
+    with conn:
+        for row in batch:
+            try:
+                conn.execute(INSERT_SQL, row)
+                written += 1
+            except _ROW_ERRORS as e:
+                print(f"[DB] Dropped invalid reading {row!r}: {e}")
+    return written
+
+#-----------------------------------------------------------------------------#
+
+def _write_batch(conn, batch):
+    """
+    Write batch, retrying transient errors (e.g. "database is locked" while
+    another gunicorn worker writes) with exponential backoff.
+    Returns the number of rows written.
+    """
+    for attempt in range(WRITE_RETRIES):
+        if attempt:
+            time.sleep(min(RETRY_BACKOFF * 2 ** (attempt - 1), RETRY_MAX_WAIT))
+
+        try:
+            return _insert(conn, batch)
+        except sqlite3.Error as e:
+            print(f"[DB] Write of {len(batch)} readings failed "
+                  f"(attempt {attempt + 1}/{WRITE_RETRIES}): {e}")
+
+    print(f"[DB] Giving up, {len(batch)} readings lost")
+    return 0
+
+#-----------------------------------------------------------------------------#
+
+def _writer_loop():
+    """Write queued readings in batches until stopped and the queue is empty."""
+    # The writer keeps one pooled connection for its whole lifetime
+    with get_connection() as conn:
+        while not (_stop.is_set() and _queue.empty()):
+            batch = _drain(FLUSH_INTERVAL)
+            if not batch or not _write_batch(conn, batch):
+                continue
+
+            for callback in _flush_listeners:
+                callback()
+
+#-----------------------------------------------------------------------------#
+
+def start_writer():
+    """Start the background writer thread (only once per process)."""
+    global _thread
+    if _thread is not None:
+        return
+
+    _thread = threading.Thread(target=_writer_loop, name="db-writer",
+                               daemon=True)
+    _thread.start()
+    atexit.register(stop_writer)
+
+#-----------------------------------------------------------------------------#
+
+def stop_writer(timeout=5.0):
+    """Flush pending readings and stop the writer thread."""
+    global _thread
+    if _thread is None:
+        return
+
+    _stop.set()
+    _thread.join(timeout)
+    _thread = None
+#-----------------------------------------------------------------------------#
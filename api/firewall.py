@@ -37,63 +37,159 @@ Notes:
 import subprocess
 import ipaddress
 import socket
-import re
+import struct
+
+try:
+    import fcntl                # Linux only (used for netmask detection)
+except ImportError:
+    fcntl = None
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Setup
+
+# ioctl request codes from <linux/sockios.h>
+_SIOCGIFADDR    = 0x8915
+_SIOCGIFNETMASK = 0x891b
+
+# Cached stdout of 'sudo ufw status verbose' (fetched once per setup run)
+_STATUS_CACHE = None
 #-----------------------------------------------------------------------------#
 
 
 
 #-----------------------------------------------------------------------------#
 # Function Defs
+def _detect_netmask_linux(sock, local_ip):
+    """
+    Return the netmask of the interface that owns local_ip, read via
+    SIOCGIFADDR / SIOCGIFNETMASK ioctls. Returns None if not found.
+    """
+    for _, iface in socket.if_nameindex():
+        ifreq = struct.pack("256s", iface[:15].encode())
+        try:
+            addr = fcntl.ioctl(sock.fileno(), _SIOCGIFADDR, ifreq)
+            if socket.inet_ntoa(addr[20:24]) != local_ip:
+                continue
+            mask = fcntl.ioctl(sock.fileno(), _SIOCGIFNETMASK, ifreq)
+            return socket.inet_ntoa(mask[20:24])
+        except OSError:
+            continue    # interface without IPv4 address
+
+    return None
+
+#-----------------------------------------------------------------------------#
+
 def get_local_network_cidr():
     """
     Determine the IPv4 address of the Raspberry Pi and return the 
-    corresponding /24 subnet in CIDR notation.
+    corresponding subnet in CIDR notation.
 
     Example:
         '192.168.178.0/24'
 
     Notes:
-        • Subnet mask is assumed to be /24 — can be expanded in the future 
-          to detect real netmask dynamically.
+        • On Linux the real netmask of the outbound interface is read 
+          via ioctl. A /24 subnet is assumed if this is not possible.
     """
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    netmask = None
     try:
-        s.connect(("10.255.255.255", 1))    # "Fake" outbound connect
-        local_ip = s.getsockname()[0]
-    except:
-        local_ip = "127.0.0.1"
+        try:
+            s.connect(("10.255.255.255", 1))    # "Fake" outbound connect
+            local_ip = s.getsockname()[0]
+        except:
+            local_ip = "127.0.0.1"
+
+        # Separate try: a failed netmask lookup only costs the mask (/24),
+        # never the already known IP
+        if fcntl is not None:
+            try:
+                netmask = _detect_netmask_linux(s, local_ip)
+            except Exception:
+                netmask = None
     finally:
         s.close()
 
-    network = ipaddress.IPv4Network(local_ip + "/24", strict=False)
+    network = ipaddress.IPv4Network(f"{local_ip}/{netmask or 24}", strict=False)
     return str(network)
 
 #-----------------------------------------------------------------------------#
 
 def run(cmd):
     """
-    Execute a shell command via subprocess without raising exceptions.
-    Used mainly for calling UFW commands.
+    Execute a command (argv list, no shell) via subprocess without 
+    raising exceptions. Used mainly for calling UFW commands.
+    """
+    print("[UFW]", " ".join(cmd))
+    try:
+        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                       check=False)
+    except OSError as e:
+        print("[UFW] Failed:", e)
+
+#-----------------------------------------------------------------------------#
+
+def _ufw_status():
     """
-    print("[UFW]", cmd)
-    subprocess.run(cmd, shell=True, stdout=subprocess.PIPE,
-                   stderr=subprocess.PIPE)
+    Return the output of 'ufw status verbose'.
+    The command is executed only once; later calls reuse the cached text.
+    """
+    global _STATUS_CACHE
+    if _STATUS_CACHE is None:
+        try:
+            result = subprocess.run(["sudo", "ufw", "status", "verbose"],
+                                    stdout=subprocess.PIPE, check=False)
+            _STATUS_CACHE = result.stdout.decode()
+        except OSError as e:
+            print("[UFW] Failed:", e)
+            _STATUS_CACHE = ""
+    return _STATUS_CACHE
 
 #-----------------------------------------------------------------------------#
 
-def ufw_rule_exists(rule_regex):
+def _parse_ufw_status(text):
     """
-    Check whether a UFW rule already exists by searching the output of
-    'ufw status' using a regular expression.
+    Parse 'ufw status verbose' output into sets for O(1) lookups.
 
     Returns:
-        True  — rule exists
-        False — rule does not exist
+        (defaults, rules)
+        defaults — set of (policy, direction), e.g. ("deny", "incoming")
+        rules    — set of (from, action, port), e.g.
+                   ("192.168.178.0/24", "ALLOW IN", 5000)
+
+    Notes:
+        • IPv6 rules and port ranges/services are skipped — they are not
+          managed by setup_firewall().
     """
-    result = subprocess.run("sudo ufw status", shell=True, stdout=subprocess.PIPE)
-    rules = result.stdout.decode()
+    defaults = set()
+    rules = set()
 
-    return re.search(rule_regex, rules) is not None
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()    # drop rule comments
+
+        # e.g. "Default: deny (incoming), allow (outgoing), disabled (routed)"
+        if line.startswith("Default:"):
+            for entry in line[len("Default:"):].split(","):
+                parts = entry.split()
+                if len(parts) == 2:
+                    defaults.add((parts[0], parts[1].strip("()")))
+            continue
+
+        # e.g. "5000                       ALLOW IN    192.168.178.0/24"
+        parts = line.split()
+        if len(parts) < 3 or "(v6)" in line:
+            continue
+
+        port = parts[0].split("/", 1)[0]        # "5000/tcp" -> "5000"
+        if not port.isdigit():
+            continue
+
+        rules.add((parts[-1], " ".join(parts[1:-1]), int(port)))
+
+    return defaults, rules
 
 #-----------------------------------------------------------------------------#
 
@@ -112,28 +208,33 @@ def setup_firewall(port=5000):
     Args:
         port (int): The API port that should be accessible in the LAN.
     """
+    global _STATUS_CACHE
+    _STATUS_CACHE = None    # Query the current rules once for this run
+
     subnet = get_local_network_cidr()
     print(f"Detected subnet: {subnet}")
 
+    defaults, rules = _parse_ufw_status(_ufw_status())
+
     # 1. Default policies (incoming deny / outgoing allow)
-    if not ufw_rule_exists(r"Default:\s+deny\s+\(incoming\)"):
-        run("sudo ufw default deny incoming")
+    if ("deny", "incoming") not in defaults:
+        run(["sudo", "ufw", "default", "deny", "incoming"])
 
-    if not ufw_rule_exists(r"Default:\s+allow\s+\(outgoing\)"):
-        run("sudo ufw default allow outgoing")
+    if ("allow", "outgoing") not in defaults:
+        run(["sudo", "ufw", "default", "allow", "outgoing"])
 
     # 2. Allow API port (e.g. 5000) from local subnet
-    rule_5000 = rf"{subnet}.*ALLOW IN.*{port}"
-    if not ufw_rule_exists(rule_5000):
-        run(f"sudo ufw allow from {subnet} to any port {port}")
+    if (subnet, "ALLOW IN", port) not in rules:
+        run(["sudo", "ufw", "allow", "from", subnet,
+             "to", "any", "port", str(port)])
 
     # 3. Allow SSH access from the LAN only
-    rule_ssh = rf"{subnet}.*ALLOW IN.*22"
-    if not ufw_rule_exists(rule_ssh):
-        run(f"sudo ufw allow from {subnet} to any port 22")
+    if (subnet, "ALLOW IN", 22) not in rules:
+        run(["sudo", "ufw", "allow", "from", subnet,
+             "to", "any", "port", "22"])
 
     # 4. Activate UFW safely (no reset)
-    run("sudo ufw --force enable")
+    run(["sudo", "ufw", "--force", "enable"])
 
     print("Firewall configured without resetting existing rules.")
 #-----------------------------------------------------------------------------#
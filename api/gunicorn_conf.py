@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+#-----------------------------------------------------------------------------#
+"""
+File:           gunicorn_conf.py
+Author(s):      Mika Paul Salewski
+Created:        2026-10-15
+Last Updated:   2026-10-15
+Version:        2026.10.15
+
+Title:
+    Gunicorn configuration for the Raspberry Pi REST API backend.
+
+Short Description:
+    Runs the Flask app with gevent workers instead of Werkzeug's development
+    server. Each worker multiplexes many concurrent, mostly I/O-bound
+    requests (sensor POSTs, dashboard polls) via greenlets.
+
+License:
+    CC BY-NC-SA 4.0
+    See: https://creativecommons.org/licenses/by-nc-sa/4.0/deed.en
+
+Usage Instructions:
+    $ pip3 install gunicorn gevent
+    $ cd api
+    $ gunicorn -c gunicorn_conf.py server:app
+
+Notes:
+    • server.py is imported once per worker (no preload_app): the SQLite
+      pool and the db_writer thread must not be shared across fork().
+    • One-time startup work (UFW rules, table creation/migrations) runs
+      once in the master via on_starting, before any worker is forked;
+      server.py then skips it (MSA_SETUP_DONE is inherited).
+    • SQLite calls do not yield to the gevent hub; the queries used here
+      are short, so this is acceptable for a small Raspberry Pi setup.
+"""
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Libs / Includes
+
+import os
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Server Socket
+
+bind = "0.0.0.0:5000"
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Worker Processes
+
+worker_class = "gevent"
+workers = 2
+worker_connections = 500
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Logging
+
+accesslog = "-"
+errorlog = "-"
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Server Hooks
+
+def on_starting(server):
+    """
+    Runs once in the master process before the workers are forked:
+    firewall setup and database initialization (incl. migrations).
+    """
+    import firewall
+    import database
+
+    firewall.setup_firewall(port=5000)
+    database.init_db()
+    database.pool.close()   # workers must not inherit open connections
+
+    os.environ["MSA_SETUP_DONE"] = "1"
+#-----------------------------------------------------------------------------#
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+#-----------------------------------------------------------------------------#
+"""
+File:           http_client.py
+Author(s):      Mika Paul Salewski
+Created:        2026-10-15
+Last Updated:   2026-10-15
+Version:        2026.10.15
+
+Title:
+    Shared HTTP client setup for the Pi-side scripts.
+
+Short Description:
+    Builds the requests session used by the scripts in src/ to talk to the
+    REST backend (send_data.py, read_i2c.py, rpi_server_iot_informer.py),
+    so their headers and timeouts cannot drift apart.
+
+License:
+    CC BY-NC-SA 4.0
+    See: https://creativecommons.org/licenses/by-nc-sa/4.0/deed.en
+
+Notes:
+    • Not imported by the backend itself (requests is a client dependency).
+    • Every script sends from a single thread, so requests' default
+      connection pool is enough; no custom HTTPAdapter is mounted.
+"""
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Libs / Includes
+
+import requests
+
+import config
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Setup
+
+# (connect, read) timeout in seconds: the backend runs on the same Pi/LAN,
+# so a slow answer means it is stalled. (TCP_NODELAY is urllib3's default.)
+TIMEOUT = (0.5, 1.0)
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Function Defs
+
+def make_session():
+    """
+    Return a persistent HTTP session (keep-alive) that sends the API key
+    (config.API_KEY) as default header with every request.
+    """
+    session = requests.Session()
+    session.headers["X-API-Key"] = config.API_KEY
+    return session
+#-----------------------------------------------------------------------------#
@@ -23,12 +23,22 @@ Notes:
     • Routes under this blueprint expose sensor information stored in the 
       SQLite database managed by db_models.py.
     • /sensors          → Renders a simple HTML page for viewing sensor data.
-    • /sensors/data     → Returns the latest 50 entries as JSON.
-    • /sensors/add      → Accepts POST form data and stores a new reading.
+    • /sensors/data     → Returns the latest 50 entries as JSON
+                          (ETag = newest row id, supports If-None-Match).
+    • /sensors/add      → Accepts POST form or JSON data and queues a new reading
+                          (written by db_writer within a few milliseconds).
+    • Values are coerced to float on input (HTTP 400 if not numeric) and
+      stored as REAL, so JSON responses carry numbers, not strings.
+    • /sensors/add_bulk → Accepts a JSON array of readings and stores them
+                          in one transaction (alias: /sensors/add_batch).
+    • Read responses are cached as serialized JSON for CACHE_TTL seconds,
+      keyed by route and query parameters, and dropped on every insert.
+      Bodies >= COMPRESS_MIN_SIZE bytes are cached gzip-compressed too and
+      served with Content-Encoding: gzip if the client accepts it.
     • Optional Security:
           - @require_basic_auth can secure the dashboard UI.
           - @require_api_key can restrict write-access to IoT devices.
-    • Tables are guaranteed to exist at import via create_tables().
+    • Tables are created once at startup via database.init_db() in server.py.
 """
 #-----------------------------------------------------------------------------#
 
@@ -37,9 +47,15 @@ Notes:
 #-----------------------------------------------------------------------------#
 # Libs / Includes
 
-from flask import Blueprint, request, render_template, jsonify
-from db_models import create_tables
+from flask import Blueprint, request, render_template, jsonify, Response
 from database import get_connection
+import db_writer
+import queue
+import gzip
+import math
+import threading
+from cachetools import TTLCache
+from orjson import dumps as ojdumps
 # from auth import require_api_key, require_basic_auth   # Optional per-route security
 #-----------------------------------------------------------------------------#
 
@@ -49,7 +65,151 @@ from database import get_connection
 # Blueprint Setup
 
 sensors_bp = Blueprint("sensors", __name__, template_folder="templates/")
-create_tables()  # Ensure DB tables exist
+
+# Number of entries returned by /sensors/data
+RECENT_LIMIT = 50
+
+# Constant SQL text, so SQLite's statement cache can reuse the prepared query
+_SQL_RECENT = ('SELECT sensor_type, value, timestamp FROM sensor_data '
+               'WHERE id <= ? ORDER BY id DESC LIMIT ?')
+_SQL_MAX_ID = 'SELECT MAX(id) FROM sensor_data'
+_SQL_BY_TYPE = ('SELECT sensor_type, value, timestamp FROM sensor_data '
+                'WHERE sensor_type = ? ORDER BY id DESC LIMIT ?')
+
+# Short-lived cache of serialized read responses (cleared on insert)
+CACHE_TTL = 2.0
+# private: authenticated data, browser cache only (no shared proxies)
+_DATA_CACHE_CONTROL = f"private, max-age={int(CACHE_TTL)}, stale-while-revalidate=5"
+
+# Read responses at least this large are also cached gzip-compressed
+COMPRESS_MIN_SIZE = 512
+
+# Column names of the sensor_data rows returned by /sensors/get
+_ROW_KEYS = ("sensor_type", "value", "timestamp")
+
+# Max. number of readings accepted by one /sensors/add_bulk request
+BULK_MAX = 1000
+
+# Pre-serialized success body for /sensors/add
+_OK = b'{"status":"ok"}'
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Response Cache
+
+_cache = TTLCache(maxsize=128, ttl=CACHE_TTL)
+_cache_lock = threading.Lock()
+_cache_generation = 0       # bumped on every invalidation
+
+# Last /sensors/data build as (max_id, etag, body, gz_body); outlives the
+# TTL cache and is reused as long as no new row was inserted
+_data_snapshot = None
+
+
+def _cached(key, build):
+    """
+    Return the cached value for key, or call build() and cache its result.
+    A result is not stored if the cache was invalidated while it was built,
+    so a read racing with an insert cannot re-cache stale data.
+    """
+    with _cache_lock:
+        value = _cache.get(key)
+        generation = _cache_generation
+    if value is not None:
+        return value
+
+    value = build()
+
+    with _cache_lock:
+        if generation == _cache_generation:
+            _cache[key] = value
+    return value
+
+
+def invalidate_cache():
+    """Drop all cached responses (called after new readings are stored)."""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _cache.clear()
+
+
+def _compress(body):
+    """Return (body, gzipped body or None) for caching a JSON response."""
+    if len(body) < COMPRESS_MIN_SIZE:
+        return body, None
+    return body, gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def _json_response(body, gz_body, etag=None):
+    """
+    Build a JSON response from cached bodies, sending the gzipped body if
+    the client accepts it. With an etag, a matching If-None-Match gives 304.
+    """
+    use_gz = gz_body is not None and request.accept_encodings["gzip"] > 0
+    if use_gz and etag:
+        etag += "-gz"       # distinct validator per representation
+
+    if etag and request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(gz_body if use_gz else body, mimetype="application/json")
+        if use_gz:
+            resp.headers["Content-Encoding"] = "gzip"
+
+    if etag:
+        resp.set_etag(etag)
+    if gz_body is not None:
+        resp.vary.add("Accept-Encoding")
+    return resp
+
+
+# Readings from /sensors/add become visible once db_writer commits them
+db_writer.add_flush_listener(invalidate_cache)
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Validation
+
+def _parse_value(value):
+    """
+    Coerce a submitted sensor value to float.
+    Returns None for non-numeric, NaN or infinite values.
+    """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+#-----------------------------------------------------------------------------#
+
+def _parse_reading(fields):
+    """
+    Validate one submitted reading (form data or JSON object).
+    Returns ((sensor_type, float_value), None) if it is valid,
+    otherwise (None, error_message).
+    """
+    sensor_type = fields.get("sensor_type")
+    value = fields.get("value")
+
+    # JSON may carry numbers/objects/lists here; only strings can be stored
+    if not isinstance(sensor_type, str) or not sensor_type:
+        return None, "sensor_type must be a non-empty string"
+
+    # value may be a JSON number, so 0 / 0.0 must count as present
+    if value is None or value == "":
+        return None, "value is required"
+
+    number = _parse_value(value)
+    if number is None:
+        return None, "value must be a number"
+
+    return (sensor_type, number), None
 #-----------------------------------------------------------------------------#
 
 
@@ -67,33 +227,108 @@ def index():
 
 @sensors_bp.route('/sensors/data')
 def get_data():
-    """Return latest 50 sensor entries as JSON."""
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute('SELECT sensor_type, value, timestamp FROM sensor_data ORDER BY id DESC LIMIT 50')
-    rows = c.fetchall()
-    conn.close()
+    """
+    Return latest 50 sensor entries as JSON.
+
+    The ETag is the newest row id (MAX(id)); clients sending a matching
+    If-None-Match get a 304. If no row was inserted since the last build,
+    the serialized (and gzipped) body is reused without re-querying.
+    """
+    def build():
+        global _data_snapshot
+        with get_connection() as conn:
+            max_id = conn.execute(_SQL_MAX_ID).fetchone()[0] or 0
+
+            snapshot = _data_snapshot
+            if snapshot is not None and snapshot[0] == max_id:
+                return snapshot[1:]
+
+            # Bounded by max_id so body and ETag describe the same rows
+            rows = conn.execute(_SQL_RECENT, (max_id, RECENT_LIMIT)).fetchall()
 
-    return jsonify(rows)
+        result = (str(max_id), *_compress(ojdumps(rows)))
+        _data_snapshot = (max_id, *result)
+        return result
+
+    etag, body, gz_body = _cached("data", build)
+
+    resp = _json_response(body, gz_body, etag)
+    resp.headers["Cache-Control"] = _DATA_CACHE_CONTROL
+    return resp
 
 #-----------------------------------------------------------------------------#
 
 @sensors_bp.route('/sensors/add', methods=['POST'])
 # @require_api_key()                            # Optional: Secure write access
 def add():
-    """Insert a new sensor reading into the database."""
-    sensor_type = request.form.get('sensor_type')
-    value = request.form.get('value')
+    """
+    Queue a new sensor reading for insertion into the database.
+    Accepts form data or a JSON object {"sensor_type": ..., "value": ...}.
+    """
+    if request.is_json:
+        fields = request.get_json(silent=True)
+        if not isinstance(fields, dict):
+            return jsonify({"error": "expected a JSON object"}), 400
+    else:
+        fields = request.form
+
+    # A submission without value is accepted and ignored (as before);
+    # 0 / 0.0 from JSON count as present
+    value = fields.get('value')
+    if value is not None and value != "":
+        reading, error = _parse_reading(fields)
+        if error:
+            return jsonify({"error": error}), 400
+
+        try:
+            db_writer.enqueue(*reading)
+        except queue.Full:
+            return jsonify({"error": "write queue full"}), 503
+
+    return Response(_OK, mimetype="application/json")
+
+#-----------------------------------------------------------------------------#
+
+@sensors_bp.route('/sensors/add_bulk', methods=['POST'])
+@sensors_bp.route('/sensors/add_batch', methods=['POST'])   # alias (read_i2c.py)
+# @require_api_key()                            # Optional: Secure write access
+def add_bulk():
+    """
+    Insert several sensor readings at once (single transaction).
+
+    Request Body (JSON):
+        [
+            {"sensor_type": "temperature_msa_room", "value": 23.1},
+            {"sensor_type": "humidity_msa_room",    "value": 45.8},
+            ...
+        ]
+
+    Either all readings are stored or none (HTTP 400 on invalid input).
+    """
+    payload = request.get_json(silent=True)
+
+    if not isinstance(payload, list) or not payload:
+        return jsonify({"error": "expected a non-empty JSON array"}), 400
+
+    if len(payload) > BULK_MAX:
+        return jsonify({"error": f"at most {BULK_MAX} readings per request"}), 400
+
+    rows = []
+    for entry in payload:
+        if not isinstance(entry, dict):
+            return jsonify({"error": "each reading must be an object"}), 400
+
+        reading, error = _parse_reading(entry)
+        if error:
+            return jsonify({"error": error}), 400
+
+        rows.append(reading)
 
-    if sensor_type and value:
-        conn = get_connection()
-        c = conn.cursor()
-        c.execute('INSERT INTO sensor_data (sensor_type, value) VALUES (?, ?)',
-                  (sensor_type, value))
-        conn.commit()
-        conn.close()
+    with get_connection() as conn, conn:
+        conn.executemany(db_writer.INSERT_SQL, rows)
+    invalidate_cache()
 
-    return jsonify({"status": "ok"})
+    return jsonify({"status": "ok", "count": len(rows)})
 
 #-----------------------------------------------------------------------------#
 
@@ -120,18 +355,13 @@ def get():
     if not sensor_type:
         return jsonify({"error": "sensor_type parameter is required"}), 400
 
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute(
-        'SELECT sensor_type, value, timestamp FROM sensor_data '
-        'WHERE sensor_type = ? ORDER BY id DESC LIMIT ?',
-        (sensor_type, limit)
-    )
-    rows = c.fetchall()
-    conn.close()
+    def build():
+        with get_connection() as conn:
+            rows = conn.execute(_SQL_BY_TYPE, (sensor_type, limit)).fetchall()
 
-    # Convert each row into a dict
-    result = [{"sensor_type": r[0], "value": r[1], "timestamp": r[2]} for r in rows]
+        # Serialize directly with orjson and skip jsonify's extra wrapping
+        return _compress(ojdumps([dict(zip(_ROW_KEYS, r)) for r in rows]))
 
-    return jsonify(result)
+    body, gz_body = _cached(("get", sensor_type, limit), build)
+    return _json_response(body, gz_body)
 #-----------------------------------------------------------------------------#    
\ No newline at end of file
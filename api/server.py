@@ -23,9 +23,9 @@ Usage Instructions:
     Run development server:
         $ python3 api/server.py
 
-    Run production server (planned):
-        $ gunicorn --bind 0.0.0.0:5000 server:app \
-                   --access-logfile - --error-logfile -
+    Run production server (gevent workers, see gunicorn_conf.py):
+        $ cd api
+        $ gunicorn -c gunicorn_conf.py server:app
 
 Accessing the API:
     In a browser:
@@ -55,39 +55,82 @@ Notes:
 #-----------------------------------------------------------------------------#
 # Libs / Includes
 
-from flask import Flask, render_template, request
+from flask import Flask, render_template, request, jsonify, Response
+from markupsafe import escape
+from flask.json.provider import DefaultJSONProvider
+import orjson
 from routes.sensors import sensors_bp
 import database
+import db_writer
 from datetime import datetime, timezone
+from functools import lru_cache
 import socket
+import time
 import subprocess
+import sys
 import os
+from pathlib import Path
 from auth import require_api_key, require_basic_auth, require_auth_everywhere
 import firewall
 #-----------------------------------------------------------------------------#
 
 
 
+#-----------------------------------------------------------------------------#
+# JSON Provider
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson (C extension).
+    Used by every jsonify() call; output is compact and keys keep their
+    insertion order (no sorting, no indentation).
+    """
+    sort_keys = False
+    compact = True
+
+    def dumps(self, obj, **kwargs):
+        # kwargs (indent, separators, ...) are ignored — orjson is always compact
+        return orjson.dumps(obj, default=self.default).decode()
+#-----------------------------------------------------------------------------#
+
+
+
 #-----------------------------------------------------------------------------#
 # Setup
 
-# Set up local firewall for security (blocks unwanted traffic)
-firewall.setup_firewall(port=5000)
+# Resolved once: directory of this file and the repo's src/ scripts
+HERE = Path(__file__).resolve().parent
+SRC_DIR = HERE.parent / "src"
+
+# Set by gunicorn_conf.py once firewall and database setup are done
+SETUP_DONE_ENV = "MSA_SETUP_DONE"
 
 
 # Record process start time (used for uptime display on homepage)
 START_TIME = datetime.now(timezone.utc)
+STARTED_AT_ISO = START_TIME.isoformat()
+
+# Monotonic reference for uptime (cheap, immune to wall-clock changes)
+START_MONO = time.monotonic()
 
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Protect ALL endpoints with authentication
-# Only '/' is publicly accessible
-require_auth_everywhere(app, exempt_paths=['/'])
+# Only '/' and its uptime feed are publicly accessible
+require_auth_everywhere(app, exempt_paths=['/', '/uptime.json'])
 
 
-# Initialize database connection and tables
-database.init_db()
+# One-time setup: local firewall (blocks unwanted traffic) and database
+# tables/migrations. Under gunicorn it runs once in the master process
+# (on_starting in gunicorn_conf.py), not again in every worker.
+if os.environ.get(SETUP_DONE_ENV) != "1":
+    firewall.setup_firewall(port=5000)
+    database.init_db()
+
+# Start the background writer that batches sensor inserts (per process)
+db_writer.start_writer()
 
 
 # Register blueprints (routes are organized in modules)
@@ -95,12 +138,13 @@ app.register_blueprint(sensors_bp)
 
 
 # Optionally start external I2C data-reading script
-#i2c_script = os.path.join(os.path.dirname(__file__), "../src/py/read_i2c.py")
-#subprocess.Popen(["python3", i2c_script])
+#subprocess.Popen([sys.executable, str(SRC_DIR / "py/read_i2c.py")])
 
-# autostart i2c connection to arduino
-rpi_server_iot_informer = os.path.join(os.path.dirname(__file__), "../src/c/iot_informer/rpi_server_iot_informer.py")
-subprocess.Popen(["python3", rpi_server_iot_informer])
+# The i2c connection to the arduino (IoT informer) is no longer started at
+# import: under gunicorn every worker would spawn its own copy. It runs as
+# its own service (src/c/iot_informer/msa-iot-informer.service) and is only
+# autostarted by the development server below.
+INFORMER_SCRIPT = SRC_DIR / "c/iot_informer/rpi_server_iot_informer.py"
 #-----------------------------------------------------------------------------#
 
 
@@ -124,56 +168,92 @@ def get_local_ip():
 
 	return ip
 
+
+# The Pi's LAN IP is stable for the process lifetime: resolve it only once
+PI_IP = get_local_ip()
+
 #-----------------------------------------------------------------------------#
 
-def format_timedelta(delta):
-	"""Return a human friendly string for a timedelta object."""
-	seconds = int(delta.total_seconds())
-	days, seconds = divmod(seconds, 86400)
-	hours, seconds = divmod(seconds, 3600)
-	minutes, seconds = divmod(seconds, 60)
-	parts = []
-	
-	if days:
-		parts.append(f"{days}d")
-	
-	if hours:
-		parts.append(f"{hours}h")
-	
-	if minutes:
-		parts.append(f"{minutes}m")
-	
-	parts.append(f"{seconds}s")
-	return ' '.join(parts)
+@lru_cache(maxsize=4)
+def format_uptime_seconds(seconds):
+	"""
+	Return a human friendly string like "1d 2h 5m 3s" for whole seconds.
+	Zero units (except seconds) are omitted. Cached, so repeated homepage
+	hits within the same second reduce to a dict lookup.
+	"""
+	days, rest = divmod(seconds, 86400)
+	hours, rest = divmod(rest, 3600)
+	minutes, seconds = divmod(rest, 60)
+
+	return (
+		(f"{days}d " if days else "")
+		+ (f"{hours}h " if hours else "")
+		+ (f"{minutes}m " if minutes else "")
+		+ f"{seconds}s"
+		)
 
 #-----------------------------------------------------------------------------#
 
-@app.route('/')
-def index():
-	"""Render the quiet server homepage and show uptime/info."""
-	now = datetime.now(timezone.utc)
-	uptime = now - START_TIME
+def uptime_str():
+	"""Return the process uptime as a human friendly string."""
+	return format_uptime_seconds(int(time.monotonic() - START_MONO))
+
+#-----------------------------------------------------------------------------#
 
-	uptime_str = format_timedelta(uptime)
+def render_homepage_shell():
+	"""
+	Render the homepage once with placeholders for the only values that
+	change between requests (uptime, host). Called at startup.
+	"""
 	# created date is fixed as requested
 	created_on = '21.11.2025'
 	owner = 'Mika Paul Salewski'
-	pi_ip = get_local_ip()
-
-	return render_template(
-		'server_homepage.html', 
-		uptime=uptime_str, 
-		started_at=START_TIME.isoformat(), 
-		created_on=created_on, 
-		owner=owner,
-		pi_ip=pi_ip
-		)
+
+	# url_for() in the templates needs a request context
+	with app.test_request_context('/'):
+		return render_template(
+			'server_homepage.html', 
+			uptime='__UPTIME__', 
+			host='__HOST__',
+			started_at=STARTED_AT_ISO, 
+			created_on=created_on, 
+			owner=owner,
+			pi_ip=PI_IP
+			)
+
+#-----------------------------------------------------------------------------#
+
+@app.route('/')
+def index():
+	"""Serve the pre-rendered homepage with the current uptime/host filled in."""
+	html = (STATIC_HOME
+		.replace('__UPTIME__', uptime_str(), 1)
+		.replace('__HOST__', str(escape(request.host)), 1))
+
+	return Response(html, mimetype='text/html')
+
+#-----------------------------------------------------------------------------#
+
+@app.route('/uptime.json')
+def uptime():
+	"""Return the current uptime; polled by the homepage for live updates."""
+	resp = jsonify(uptime=uptime_str())
+	resp.headers['Cache-Control'] = 'no-store'
+	return resp
+
+
+# Static homepage shell, rendered once (blueprints must be registered first)
+STATIC_HOME = render_homepage_shell()
 #-----------------------------------------------------------------------------#
 	 
 
 
 #-----------------------------------------------------------------------------#
 if __name__ == '__main__':
+	# autostart i2c connection to arduino (single process, dev server only)
+	# sys.executable: same interpreter/venv as the server, no PATH lookup
+	subprocess.Popen([sys.executable, str(INFORMER_SCRIPT)])
+
 	# 0.0.0.0 = Allow connections from all devices in the local network
 	app.run(host='0.0.0.0', port=5000, debug=False)
 #-----------------------------------------------------------------------------#
@@ -21,9 +21,15 @@ License:
 
 Notes:
     • Uses smbus2 to write data to Arduino over I2C.
-    • Polls the REST API every 10 seconds.
+    • Polls the latest status every 10 seconds. By default it is read
+      directly from the server's SQLite database (read-only), skipping
+      the HTTP stack; set INFORMER_SOURCE=http to query the REST API.
+      The REST API is also used as fallback if the database is unavailable.
     • Sends data in CSV format: "sensor_type,value#"
-    • Network or server errors are handled gracefully.
+    • Network or server errors are handled gracefully and logged via the
+      logging module (run with -v to also log every I2C write).
+    • Reading sensor data from the I2C device and forwarding it to the
+      backend lives in src/py/read_i2c.py (single implementation).
 """
 #-----------------------------------------------------------------------------#
 
@@ -34,47 +40,50 @@ Notes:
 
 import smbus2 as smbus
 import time
-import requests
+import logging
+import sqlite3
 import sys
-import os
+from pathlib import Path
 
 # Allow relative import of config.py from /api
-sys.path.append(os.path.join(os.path.dirname(__file__), "../../../api"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "api"))
 import config
+from http_client import make_session, TIMEOUT
+
+log = logging.getLogger(__name__)
 #-----------------------------------------------------------------------------#
 
 
 
 #-----------------------------------------------------------------------------#
-# I2C Configuration
+# HTTP Session
 
-I2C_BUS = 1                # Raspberry Pi bus index
-I2C_ADDRESS = 0x08         # Must match Arduino/MCU address
-bus = smbus.SMBus(I2C_BUS)
+# REST endpoint for the HTTP data source (base URL from config.SERVER_URL)
+LATEST_URL = f"{config.SERVER_URL}/sensors/get"
+
+# Keep-alive session sending the API key (see api/http_client.py)
+SESSION = make_session()
 #-----------------------------------------------------------------------------#
 
 
 
 #-----------------------------------------------------------------------------#
-# I2C Read Logic
+# Direct Database Access
 
-def read_i2c_string_block(addr):
-    """
-    Reads 20-byte blocks repeatedly from the I2C device until a '#' terminator 
-    is encountered. Returns the collected ASCII string.
+_SQL_LATEST = ('SELECT value FROM sensor_data WHERE sensor_type = ? '
+               'ORDER BY id DESC LIMIT 1')
 
-    Example incoming format: "23.1,45.8#"
-    """
-    data_bytes = []
+_db = None      # read-only connection, opened on first use
+_db_down = False    # DB read failing; warn once per outage, not every poll
+#-----------------------------------------------------------------------------#
 
-    while True:
-        block = bus.read_i2c_block_data(I2C_ADDRESS, 0, 20)
 
-        for b in block:
-            if chr(b) == '#':
-                return ''.join(chr(x) for x in data_bytes)
 
-            data_bytes.append(b)
+#-----------------------------------------------------------------------------#
+# I2C Configuration
+
+I2C_BUS = 1                # Raspberry Pi bus index
+I2C_ADDRESS = 0x08         # Must match Arduino/MCU address
 #-----------------------------------------------------------------------------#
 
 
@@ -82,21 +91,21 @@ def read_i2c_string_block(addr):
 #-----------------------------------------------------------------------------#
 # I2C Write Logic
 
-def send_i2c_status(sensor_type, value):
+def send_i2c_status(bus, sensor_type, value):
 	"""
-	Sends sensor value to Arduino via I2C.
+	Sends sensor value to Arduino via I2C on the open SMBus bus.
 	Format: "sensor_type,value#"
 	"""
 	message = f"{sensor_type},{value}#"
-	#data_bytes = [ord(c) for c in message]
+	data_bytes = message.encode('ascii')
 
 	try:
-		for c in message:
-			bus.write_byte(I2C_ADDRESS, ord(c))
+		for b in data_bytes:
+			bus.write_byte(I2C_ADDRESS, b)
 		#bus.write_i2c_block_data(I2C_ADDRESS, 0, data_bytes)
-		print(f"Sent to I2C -> {message}")
+		log.debug("Sent to I2C -> %s", message)
 	except Exception as e:
-		print(f"Error sending I2C data: {e}")
+		log.warning("Error sending I2C data: %s", e)
 #-----------------------------------------------------------------------------#
 
 
@@ -105,48 +114,66 @@ def send_i2c_status(sensor_type, value):
 #-----------------------------------------------------------------------------#
 # Server Communication
 
-def send_to_server(sensor_type, value):
+def _get_latest_from_db(sensor_type):
     """
-    Sends one sensor value to the backend using POST /sensors/add.
-    Includes the API key header for authentication.
+    Reads the latest value of sensor_type directly from the server's
+    SQLite database using a read-only connection (opened once).
+    Raises sqlite3.Error if the database is not available.
     """
-    data = {"sensor_type": sensor_type, "value": value}
-    headers = {"X-API-Key": config.API_KEY}
+    global _db
+    if _db is None:
+        _db = sqlite3.connect(f"file:{config.DB_FILE}?mode=ro", uri=True)
 
-    try:
-        r = requests.post(
-            "http://localhost:5000/sensors/add",
-            data=data,
-            headers=headers,
-            timeout=5
-        )
-        r.raise_for_status()
-        print(f"Sent {sensor_type}: {value}")
-
-    except requests.RequestException as e:
-        print(f"Error sending {sensor_type}: {e}")
+    row = _db.execute(_SQL_LATEST, (sensor_type,)).fetchone()
+    return row[0] if row else None   # stored as REAL
 
 #-----------------------------------------------------------------------------#
 
 def get_latest_bathroom_status(limit=1):
+    """
+    Returns the latest 'bathroom_main' value (0.0 or 1.0) or None if an 
+    error occurs. Reads the database directly unless INFORMER_SOURCE is 
+    "http"; falls back to the REST API if the database read fails.
+    """
+    global _db, _db_down
+    if config.INFORMER_SOURCE == "db":
+        try:
+            value = _get_latest_from_db("bathroom_main")
+        except (sqlite3.Error, ValueError) as e:
+            if not _db_down:
+                log.warning("Error reading bathroom_main from DB, "
+                            "using REST API: %s", e)
+                _db_down = True
+            _db = None
+        else:
+            if _db_down:
+                log.info("DB readable again, leaving REST API fallback")
+                _db_down = False
+            return value
+
+    return get_latest_bathroom_status_http(limit)
+
+#-----------------------------------------------------------------------------#
+
+def get_latest_bathroom_status_http(limit=1):
     """
     Queries the REST API for the latest 'bathroom_main' sensor values.
     Returns the most recent value (0.0 or 1.0) or None if an error occurs.
     """
     try:
-        r = requests.get(
-            f"http://localhost:5000/sensors/get?sensor_type=bathroom_main&limit={limit}",
-            headers={"X-API-Key": config.API_KEY},
-            timeout=5
+        r = SESSION.get(
+            LATEST_URL,
+            params={"sensor_type": "bathroom_main", "limit": limit},
+            timeout=TIMEOUT
         )
         r.raise_for_status()
         data = r.json()
         if data:
-            # Take the first (latest) entry
-            return float(data[0]["value"])
+            # Take the first (latest) entry (already a JSON number)
+            return data[0]["value"]
         return None
     except Exception as e:
-        print(f"Error fetching bathroom_main status: {e}")
+        log.warning("Error fetching bathroom_main status: %s", e)
         return None
 #-----------------------------------------------------------------------------#
 
@@ -157,38 +184,15 @@ def get_latest_bathroom_status(limit=1):
 def main(poll_interval=10):
     """
     Polls server for bathroom_main status every poll_interval seconds
-    and sends the value to Arduino via I2C.
+    and sends the value to Arduino via I2C (bus closed when the loop exits).
     """
-    while True:
-        status = get_latest_bathroom_status(limit=1)
-        if status is not None:
-            send_i2c_status("bathroom_main", status)
-        time.sleep(poll_interval)
-
-
-
-
-if False:
-    def main(poll_interval=300):
-        """
-        Main read → parse → send loop.
-        Default interval: 5 minutes.
-        """
+    with smbus.SMBus(I2C_BUS) as bus:
         while True:
-            try:
-                data_str = read_i2c_string_block(I2C_ADDRESS)
-
-                if ',' in data_str:
-                    temp, hum = data_str.split(',')
-                    send_to_server("temperature_msa_room", temp)
-                    send_to_server("humidity_msa_room", hum)
-                else:
-                    print("Invalid I2C data:", data_str)
-
-            except Exception as e:
-                print("Error reading I2C:", e)
-
+            status = get_latest_bathroom_status(limit=1)
+            if status is not None:
+                send_i2c_status(bus, "bathroom_main", status)
             time.sleep(poll_interval)
+
 #-----------------------------------------------------------------------------#
 
 
@@ -197,5 +201,10 @@ if False:
 # Entrypoint
 
 if __name__ == "__main__":
+    # -v: also log every I2C write (DEBUG)
+    logging.basicConfig(
+        level=logging.DEBUG if "-v" in sys.argv[1:] else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s"
+    )
     main()
 #-----------------------------------------------------------------------------#
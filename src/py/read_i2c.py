@@ -20,15 +20,27 @@ License:
     See: https://creativecommons.org/licenses/by-nc-sa/4.0/deed.en
 
 Notes:
-    • Uses smbus2 to read 20-byte blocks until a '#' terminator is found.
-    • Expected data format: "temperature,humidity#"
-    • Values are forwarded to the backend via /sensors/add using API key auth.
-    • Poll interval defaults to 300 seconds (5 minutes).
+    • Uses smbus2 (i2c_rdwr) to read one 32-byte message per poll; it must end
+      with a '#' terminator within it (bounded retries otherwise).
+    • Expected data format: "temperature,humidity#"; both values are parsed
+      to float before sending (malformed samples are dropped locally).
+    • Both values of one poll are forwarded together in a single JSON POST
+      to /sensors/add_batch using API key auth.
+    • POSTs run on one background sender thread, so slow HTTP requests do
+      not stall I2C polling (and vice versa).
+    • Readings that cannot be delivered (backend down) are kept in a local
+      SQLite buffer (config.BUFFER_FILE, default unsent_readings.db next to
+      this script) and re-sent, oldest first, before the next fresh readings.
+    • Poll interval defaults to 300 seconds (5 minutes), on a fixed cadence.
     • NETWORK EFFECTS:
-          - If the REST API is unreachable, data will be skipped but the loop 
-            continues (non-fatal).
+          - If the REST API is unreachable or refuses the request (auth,
+            missing endpoint), data is buffered locally and the loop
+            continues (non-fatal). Only invalid payloads (400/422) are
+            dropped.
           - Malformed I2C packets are ignored gracefully.
-          - I2C_DEVICE and /sensors/add URL must match your backend setup.
+          - I2C_ADDRESS and SERVER_URL (.env) must match your backend setup.
+    • Output goes through logging: errors as WARNING, successful sends only
+      at DEBUG (run with -v to see them).
 
 Pinout:    
     • SDA --> Pin 3 (GPIO2)
@@ -43,14 +55,62 @@ Pinout:
 # Libs / Includes
 
 import smbus2 as smbus
+from smbus2 import i2c_msg
 import time
+import math
+import random
+import logging
 import requests
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 
 # Allow relative import of config.py from /api
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../api"))
 import config
+from http_client import make_session, TIMEOUT
+
+log = logging.getLogger(__name__)
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# HTTP Session
+
+# Backend endpoint (base URL from config.SERVER_URL, default 127.0.0.1:5000)
+BATCH_URL = f"{config.SERVER_URL}/sensors/add_batch"
+
+# Keep-alive session sending the API key (see api/http_client.py)
+SESSION = make_session()
+
+# Batch POSTs are not idempotent and may wait for the database write lock
+# (sqlite busy timeout: 5 s), so they get a longer read timeout. A read
+# timeout is never retried: the batch may already be stored.
+POST_TIMEOUT = (TIMEOUT[0], 10.0)
+
+# Failed sends are retried with randomized exponential backoff:
+# wait uniform(HTTP_BACKOFF) * 2**n seconds (max. HTTP_BACKOFF_CAP)
+HTTP_ATTEMPTS = 3
+HTTP_BACKOFF = (0.1, 0.5)
+HTTP_BACKOFF_CAP = 5.0
+
+# Single background sender: POSTs (and their timeouts) run off the I2C loop
+# and are delivered in order; pending sends are finished on exit
+_sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sender")
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Local Buffer (unsent readings)
+
+BUFFER_FILE = config.BUFFER_FILE  # src/py/unsent_readings.db (.env: BUFFER_FILE)
+BUFFER_MAX_ROWS = 10000    # Oldest readings are dropped beyond this
+BUFFER_FLUSH_LIMIT = 500   # Readings re-sent per request (server max: 1000)
+
+_buffer = None             # sqlite3 connection, opened by the sender thread
 #-----------------------------------------------------------------------------#
 
 
@@ -60,7 +120,11 @@ import config
 
 I2C_BUS = 1                # Raspberry Pi bus index
 I2C_ADDRESS = 0x08         # Must match Arduino/MCU address
-bus = smbus.SMBus(I2C_BUS)
+I2C_BLOCK_SIZE = 32        # Whole message in one read (Arduino Wire buffer)
+I2C_READ_ATTEMPTS = 3      # Reads without '#' before giving up
+I2C_RETRY_DELAY = (0.00025, 0.0005)  # Random wait between attempts [s]
+
+POLL_INTERVAL = 300        # Seconds between polls (5 minutes)
 #-----------------------------------------------------------------------------#
 
 
@@ -68,23 +132,49 @@ bus = smbus.SMBus(I2C_BUS)
 #-----------------------------------------------------------------------------#
 # I2C Read Logic
 
-def read_i2c_string_block(addr):
+def read_i2c_string_block(bus, addr):
     """
-    Reads 20-byte blocks repeatedly from the I2C device until a '#' terminator 
-    is encountered. Returns the collected ASCII string.
+    Reads one 32-byte message from the I2C device at addr on the open SMBus
+    bus via i2c_rdwr and returns the ASCII string before the '#' terminator.
+    A block without terminator is retried up to I2C_READ_ATTEMPTS times,
+    then ValueError is raised.
 
     Example incoming format: "23.1,45.8#"
     """
-    data_bytes = []
+    for attempt in range(I2C_READ_ATTEMPTS):
+        if attempt:
+            time.sleep(random.uniform(*I2C_RETRY_DELAY))
 
-    while True:
-        block = bus.read_i2c_block_data(I2C_ADDRESS, 0, 20)
+        # Plain I2C read (no SMBus command byte / repeated start)
+        msg = i2c_msg.read(addr, I2C_BLOCK_SIZE)
+        bus.i2c_rdwr(msg)
+        block = bytes(msg)
 
-        for b in block:
-            if chr(b) == '#':
-                return ''.join(chr(x) for x in data_bytes)
+        end = block.find(0x23)    # ASCII '#'
+        if end >= 0:
+            return block[:end].decode('ascii')
 
-            data_bytes.append(b)
+    raise ValueError(f"no '#' terminator in {I2C_READ_ATTEMPTS} I2C reads")
+
+#-----------------------------------------------------------------------------#
+
+def parse_sample(data_str):
+    """
+    Parses "temperature,humidity" into two floats.
+    Returns None for malformed, non-numeric or non-finite values.
+    """
+    parts = data_str.split(',')
+    if len(parts) != 2:
+        return None
+
+    try:
+        temp, hum = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+
+    if not (math.isfinite(temp) and math.isfinite(hum)):
+        return None
+    return temp, hum
 #-----------------------------------------------------------------------------#
 
 
@@ -92,26 +182,159 @@ def read_i2c_string_block(addr):
 #-----------------------------------------------------------------------------#
 # Server Communication
 
-def send_to_server(sensor_type, value):
+def post_batch(payload):
+    """
+    POSTs a list of {"sensor_type": ..., "value": ...} dicts to
+    /sensors/add_batch (stored all-or-nothing by the backend).
+    Raises requests.RequestException on failure.
+    """
+    r = SESSION.post(
+        BATCH_URL,
+        json=payload,
+        timeout=POST_TIMEOUT
+    )
+    r.raise_for_status()
+
+#-----------------------------------------------------------------------------#
+
+def _is_final(e):
+    """
+    True if the batch must not be sent again: the backend rejected the
+    payload itself (400/422), or the read timed out after the request
+    went out (it may have been stored, re-sending could duplicate it).
+    """
+    if isinstance(e, requests.ReadTimeout):
+        return True
+    return e.response is not None and e.response.status_code in (400, 422)
+
+#-----------------------------------------------------------------------------#
+
+def _is_retryable(e):
+    """True if retrying right away may help (no connection, 5xx, 408, 429)."""
+    if e.response is None:
+        return isinstance(e, requests.ConnectionError)  # incl. ConnectTimeout
+    return e.response.status_code >= 500 or e.response.status_code in (408, 429)
+
+#-----------------------------------------------------------------------------#
+
+def _post_with_retry(payload):
     """
-    Sends one sensor value to the backend using POST /sensors/add.
-    Includes the API key header for authentication.
+    POSTs payload (see post_batch), retrying failures up to HTTP_ATTEMPTS
+    times with randomized backoff.
+    Returns True on success, False if the backend stays unreachable or
+    refuses the request for other reasons (auth, missing endpoint, ...),
+    i.e. the readings should be kept.
+    Raises requests.RequestException if the batch must not be re-sent
+    (see _is_final).
     """
-    data = {"sensor_type": sensor_type, "value": value}
-    headers = {"X-API-Key": config.API_KEY}
+    for attempt in range(HTTP_ATTEMPTS):
+        if attempt:
+            backoff = random.uniform(*HTTP_BACKOFF) * 2 ** (attempt - 1)
+            time.sleep(min(backoff, HTTP_BACKOFF_CAP))
+
+        try:
+            post_batch(payload)
+            return True
+        except requests.RequestException as e:
+            if _is_final(e):
+                raise
+            log.warning("Error sending batch (attempt %d/%d): %s",
+                        attempt + 1, HTTP_ATTEMPTS, e)
+            if not _is_retryable(e):
+                return False    # 401/403/404: config problem, keep readings
+    return False
+
+#-----------------------------------------------------------------------------#
 
+def send_batch(payload):
+    """
+    Sends several readings in one request. Buffered readings from earlier
+    failures are sent first, so the backend stores everything oldest first
+    and the fresh readings stay the latest ones. If the backend is
+    unreachable or refuses the request (e.g. wrong API key), the readings
+    are appended to the local buffer; only a rejected payload or one with
+    unknown outcome (read timeout) is dropped.
+    Returns True on success, False otherwise.
+    """
     try:
-        r = requests.post(
-            "http://localhost:5000/sensors/add",
-            data=data,
-            headers=headers,
-            timeout=5
+        if flush_buffer() and _post_with_retry(payload):
+            log.debug("Sent batch: %s", payload)
+            return True
+    except requests.RequestException as e:
+        log.warning("Not re-sending batch %s: %s", payload, e)
+        return False
+
+    buffer_readings(payload)
+    return False
+#-----------------------------------------------------------------------------#
+
+
+
+#-----------------------------------------------------------------------------#
+# Local Buffer Logic
+#
+# Only used from the sender thread, so one sqlite3 connection is enough.
+# Note: the backend timestamps readings on arrival, i.e. re-sent readings
+# carry the time of their delivery.
+
+def _buffer_db():
+    """Returns the buffer connection, opening/creating the file on first use."""
+    global _buffer
+    if _buffer is None:
+        _buffer = sqlite3.connect(BUFFER_FILE)
+        _buffer.execute(
+            'CREATE TABLE IF NOT EXISTS unsent (sensor_type TEXT, value)'
         )
-        r.raise_for_status()
-        print(f"Sent {sensor_type}: {value}")
+    return _buffer
 
-    except requests.RequestException as e:
-        print(f"Error sending {sensor_type}: {e}")
+#-----------------------------------------------------------------------------#
+
+def buffer_readings(payload):
+    """Stores readings that could not be sent (capped at BUFFER_MAX_ROWS)."""
+    db = _buffer_db()
+
+    with db:
+        db.executemany(
+            'INSERT INTO unsent (sensor_type, value) VALUES (?, ?)',
+            [(r["sensor_type"], r["value"]) for r in payload]
+        )
+        db.execute(
+            'DELETE FROM unsent WHERE rowid <= '
+            '(SELECT MAX(rowid) FROM unsent) - ?', (BUFFER_MAX_ROWS,)
+        )
+    log.info("Buffered %d unsent readings", len(payload))
+
+#-----------------------------------------------------------------------------#
+
+def flush_buffer():
+    """
+    Re-sends buffered readings, oldest first, in batches of at most
+    BUFFER_FLUSH_LIMIT. Batches the backend rejects as invalid (400/422)
+    are dropped so they cannot block the buffer, as are batches whose
+    request timed out while reading the reply (possibly already stored).
+    Returns True once the buffer is empty, False if the backend stays
+    unreachable or refuses the request (the readings stay buffered).
+    """
+    db = _buffer_db()
+
+    while True:
+        rows = db.execute(
+            'SELECT rowid, sensor_type, value FROM unsent '
+            'ORDER BY rowid LIMIT ?', (BUFFER_FLUSH_LIMIT,)
+        ).fetchall()
+        if not rows:
+            return True
+
+        try:
+            if not _post_with_retry(
+                    [{"sensor_type": t, "value": v} for _, t, v in rows]):
+                return False
+            log.info("Re-sent %d buffered readings", len(rows))
+        except requests.RequestException as e:
+            log.warning("Dropping %d buffered readings: %s", len(rows), e)
+
+        with db:
+            db.execute('DELETE FROM unsent WHERE rowid <= ?', (rows[-1][0],))
 #-----------------------------------------------------------------------------#
 
 
@@ -119,26 +342,59 @@ def send_to_server(sensor_type, value):
 #-----------------------------------------------------------------------------#
 # Main Loop
 
-def main(poll_interval=300):
+def main(poll_interval=POLL_INTERVAL):
     """
     Main read → parse → send loop.
-    Default interval: 5 minutes.
+    Default interval: 5 minutes, measured from the start of each cycle
+    (a monotonic deadline), so the work time does not add to the period.
+    The I2C bus is opened here and closed when the loop exits.
+    """
+    with smbus.SMBus(I2C_BUS) as bus:
+        _poll_loop(bus, poll_interval)
+
+#-----------------------------------------------------------------------------#
+
+def _log_send_error(future):
     """
+    Done-callback for submitted sends: logs an exception raised inside
+    send_batch, which the executor would otherwise keep silently.
+    """
+    e = future.exception()
+    if e is not None:
+        log.error("Sender failed: %r", e, exc_info=e)
+
+#-----------------------------------------------------------------------------#
+
+def _poll_loop(bus, poll_interval):
+    """Runs the read → parse → send cycle forever on the open bus."""
+    next_poll = time.monotonic()
+
     while True:
         try:
-            data_str = read_i2c_string_block(I2C_ADDRESS)
-
-            if ',' in data_str:
-                temp, hum = data_str.split(',')
-                send_to_server("temperature_msa_room", temp)
-                send_to_server("humidity_msa_room", hum)
+            data_str = read_i2c_string_block(bus, I2C_ADDRESS)
+            sample = parse_sample(data_str)
+
+            if sample is not None:
+                temp, hum = sample
+                # Hand off to the sender thread; the next I2C read does
+                # not wait for the HTTP round trip
+                future = _sender.submit(send_batch, [
+                    {"sensor_type": "temperature_msa_room", "value": temp},
+                    {"sensor_type": "humidity_msa_room", "value": hum},
+                ])
+                future.add_done_callback(_log_send_error)
             else:
-                print("Invalid I2C data:", data_str)
+                log.warning("Invalid I2C data: %r", data_str)
 
         except Exception as e:
-            print("Error reading I2C:", e)
-
-        time.sleep(poll_interval)
+            log.warning("Error reading I2C: %s", e)
+
+        next_poll += poll_interval
+        delay = next_poll - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_poll = time.monotonic()    # fell behind: skip missed ticks
 #-----------------------------------------------------------------------------#
 
 
@@ -147,5 +403,9 @@ def main(poll_interval=300):
 # Entrypoint
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG if "-v" in sys.argv[1:] else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s"
+    )
     main()
 #-----------------------------------------------------------------------------#
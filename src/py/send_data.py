@@ -21,7 +21,7 @@ License:
 
 Usage Instructions:
     Run the script directly:
-        $ python3 src/py/send_data.py
+        $ python3 src/py/send_data.py       (add -v to log server responses)
 
     The script will send example sensor data to the local API server.
 """
@@ -33,12 +33,16 @@ Usage Instructions:
 # Libs / Includes
 
 import requests
+import logging
 import sys
 import os
 
 # Add /api folder to path to allow relative import of config.py
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../api"))
 import config  # Contains config.API_KEY for authentication
+from http_client import make_session, TIMEOUT
+
+log = logging.getLogger(__name__)
 #-----------------------------------------------------------------------------#
 
 
@@ -47,7 +51,10 @@ import config  # Contains config.API_KEY for authentication
 # Constants
 
 # API endpoint for sending sensor data
-SERVER = "http://localhost:5000/sensors/add"
+SERVER = f"{config.SERVER_URL}/sensors/add"
+
+# Keep-alive session sending the API key (see api/http_client.py)
+SESSION = make_session()
 #-----------------------------------------------------------------------------#
 
 
@@ -64,28 +71,21 @@ def send(sensor_type: str, value):
         value: The value to send (can be int, float, or str).
 
     Behavior:
-        Sends a POST request to the backend with API key authentication.
-        Prints the HTTP status code and server response.
+        Sends a JSON POST request to the backend with API key authentication
+        (the key is set once on the shared SESSION).
+        Logs the HTTP status code (INFO) and server response (DEBUG).
     """
-    # Construct data payload
-    data = {
-        "sensor_type": sensor_type,
-        "value": value
-    }
-    
-    # Include API key in request headers
-    headers = {
-        "X-API-Key": config.API_KEY
-    }
-    
-    # Send POST request
+    # Send POST request as JSON (reuses the keep-alive connection of SESSION)
     try:
-        response = requests.post(SERVER, data=data, headers=headers)
-        print(f"[INFO] Sent {sensor_type}={value}")
-        print(f"[INFO] Status: {response.status_code}")
-        print(f"[INFO] Response: {response.text}")
+        response = SESSION.post(
+            SERVER,
+            json={"sensor_type": sensor_type, "value": value},
+            timeout=TIMEOUT
+        )
+        log.info("Sent %s=%s (HTTP %d)", sensor_type, value, response.status_code)
+        log.debug("Response: %s", response.text)
     except requests.RequestException as e:
-        print(f"[ERROR] Failed to send data: {e}")
+        log.error("Failed to send data: %s", e)
 #-----------------------------------------------------------------------------#
 
 
@@ -94,6 +94,11 @@ def send(sensor_type: str, value):
 # Main / Example Usage
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG if "-v" in sys.argv[1:] else logging.INFO,
+        format="[%(levelname)s] %(message)s"
+    )
+
     # Send example sensor readings
     #send("temperature", 23.8)
     #send("room_entrance", 1)